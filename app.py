@@ -1,160 +1,500 @@
+import atexit
+import copy
+import functools
+import json
 import streamlit as st
 import yt_dlp
 import os
+import queue
 import re
+import shutil
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from yt_dlp.postprocessor import FFmpegExtractAudioPP
+
+# Worker pool for ffmpeg postprocessing, so conversions run off the
+# Streamlit script thread and don't block the next download.
+_POSTPROCESS_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# Single worker for yt-dlp downloads: the shared YoutubeDL instance is not
+# re-entrant, so downloads serialize while the script thread stays free to
+# drain progress events.
+_DOWNLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# Temp directories of finished jobs, kept alive so files can be streamed
+# to the browser, and removed when the server process exits.
+_JOB_TEMP_DIRS: set[str] = set()
+
+
+def _cleanup_job_temp_dirs():
+    for temp_dir in _JOB_TEMP_DIRS:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+atexit.register(_cleanup_job_temp_dirs)
+
+
+# Downloads drop a .info.json and thumbnail here so later analyses of the
+# same video become pure disk reads. Entries share the metadata cache TTL.
+_INFO_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'youtube_converter')
+_INFO_CACHE_TTL = 6 * 3600
+os.makedirs(_INFO_CACHE_DIR, exist_ok=True)
+
+_VIDEO_ID_RE = re.compile(r'(?:youtu\.be/|[?&]v=|/shorts/|/embed/)([A-Za-z0-9_-]{11})')
+
+# Compiled once at import: progress_hook calls these several times per tick.
+_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
 
 
 # --- HELPER FUNCTIONS ---
+# Pure string->string and called repeatedly with the same titles, so repeat
+# inputs become a dict lookup.
+@functools.lru_cache(maxsize=1024)
 def sanitize_filename(filename: str) -> str:
     """Removes invalid characters from a filename."""
-    return re.sub(r'[<>:"/\\|?*]', '_', filename)
+    return _FILENAME_RE.sub('_', filename)
 
 
 def sanitize_for_display(text: str) -> str:
     """Removes ANSI escape codes for clean display in Streamlit."""
     if not isinstance(text, str):
         return ""
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
+    return _ANSI_RE.sub('', text)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a YouTube URL to a canonical watch URL so that the same video
+    always produces the same cache key (strips tracking params, resolves
+    youtu.be short links).
+    """
+    match = _VIDEO_ID_RE.search(url)
+    if match:
+        return f"https://www.youtube.com/watch?v={match.group(1)}"
+    return url.split('&')[0]
+
+
+def _cached_info_json(video_id: str) -> dict | None:
+    """Loads the .info.json persisted by a previous download, if still fresh."""
+    path = os.path.join(_INFO_CACHE_DIR, f"{video_id}.info.json")
+    try:
+        if time.time() - os.path.getmtime(path) < _INFO_CACHE_TTL:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+# Per-format fields worth keeping: what the UI reads (height/ext/vcodec) plus
+# what format selection and the downloader need to reuse the extraction.
+_FORMAT_KEYS = ('url', 'format_id', 'ext', 'height', 'vcodec', 'acodec', 'protocol', 'tbr')
+
+
+def _trim_info(info_dict: dict) -> dict:
+    """
+    Keeps the metadata the UI consumes plus enough of each mp4-video and
+    audio-only format for handle_download to reuse the extraction, so cache
+    entries stay small.
+    """
+    return {
+        'id': info_dict.get('id'),
+        'title': info_dict.get('title'),
+        'thumbnail': info_dict.get('thumbnail'),
+        'webpage_url': info_dict.get('webpage_url'),
+        'extractor': info_dict.get('extractor'),
+        'extractor_key': info_dict.get('extractor_key'),
+        'duration': info_dict.get('duration'),
+        'formats': [
+            {key: f[key] for key in _FORMAT_KEYS if key in f}
+            for f in info_dict.get('formats', [])
+            if f.get('vcodec') == 'none' or f.get('ext') == 'mp4'
+        ],
+    }
+
+
+# Shared by both YoutubeDL instances so every request presents the same
+# client identity. Keeping the instances alive (st.cache_resource below) also
+# keeps their HTTP connection pools warm, so repeat Analyze/Download calls
+# skip the per-request DNS lookup and TLS handshake.
+_HTTP_HEADERS = {'Accept-Language': 'en-US,en;q=0.9'}
+
+# The android/ios clients answer over the innertube API with ready-to-use
+# format URLs: no watch-page fetch, no player JS, no n-signature decipher.
+# 'web' stays last as a fallback for videos those clients refuse.
+_EXTRACTOR_ARGS = {'youtube': {'player_client': ['android', 'ios', 'web'], 'player_skip': ['webpage', 'configs']}}
+
+# Analyze only needs height/ext/vcodec per format, so additionally skip
+# manifest fetches. Full resolution happens in handle_download, where URLs
+# are actually needed.
+_ANALYZE_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'skip_download': True,
+    'extract_flat': 'discard_in_playlist',
+    'youtube_include_dash_manifest': False,
+    'youtube_include_hls_manifest': False,
+    'extractor_args': _EXTRACTOR_ARGS,
+    'http_headers': _HTTP_HEADERS,
+}
+
+_DOWNLOAD_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'concurrent_fragment_downloads': 8,
+    'http_chunk_size': 10485760,
+    'postprocessors': [],
+    'extractor_args': _EXTRACTOR_ARGS,
+    'http_headers': _HTTP_HEADERS,
+    'writeinfojson': True,
+    'writethumbnail': True,
+}
+
+# YoutubeDL registers progress hooks at construction time, so the shared
+# download instance gets one dispatcher that forwards to whatever hook the
+# current download installed here.
+_ACTIVE_PROGRESS_HOOK = {'callback': None}
+
+
+def _dispatch_progress(d):
+    callback = _ACTIVE_PROGRESS_HOOK['callback']
+    if callback is not None:
+        callback(d)
+
+
+_ANALYZE_TLS = threading.local()
+
+
+def _analyze_ydl() -> yt_dlp.YoutubeDL:
+    """
+    One YoutubeDL per thread for Analyze: instances are not re-entrant, and
+    get_video_info_batch fans extraction out across worker threads, so each
+    thread keeps and reuses its own instance.
+    """
+    ydl = getattr(_ANALYZE_TLS, 'ydl', None)
+    if ydl is None:
+        ydl = _ANALYZE_TLS.ydl = yt_dlp.YoutubeDL(_ANALYZE_OPTS)
+    return ydl
+
+
+@st.cache_resource(show_spinner=False)
+def _download_ydl() -> yt_dlp.YoutubeDL:
+    """One YoutubeDL per process for downloads; per-call options go via params."""
+    return yt_dlp.YoutubeDL({**_DOWNLOAD_OPTS, 'progress_hooks': [_dispatch_progress]})
+
+
+@st.cache_data(ttl=_INFO_CACHE_TTL, max_entries=512, persist="disk", show_spinner=False)
+def _fetch_video_info(canonical_url: str) -> dict | None:
+    """
+    Fetches video metadata, cached in memory and on disk per canonical URL.
+    Raises DownloadError on failure so a transient error is never cached as
+    'video not found' — only successful extractions enter the cache.
+    """
+    match = _VIDEO_ID_RE.search(canonical_url)
+    if match:
+        cached = _cached_info_json(match.group(1))
+        if cached:
+            return _trim_info(cached)
+    info_dict = _analyze_ydl().extract_info(canonical_url, download=False)
+    return _trim_info(info_dict) if info_dict else None
 
 
 def get_video_info(url: str) -> dict | None:
-    """Fetches full video metadata."""
-    ydl_opts = {'quiet': True, 'no_warnings': True, 'skip_download': True}
+    """Fetches video metadata, serving repeat analyses of the same video from cache."""
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            return ydl.extract_info(url, download=False)
+        return _fetch_video_info(canonicalize_url(url))
     except yt_dlp.utils.DownloadError:
         return None
 
 
+def get_video_info_batch(urls: list[str], max_workers: int = 3) -> dict[str, dict | None]:
+    """
+    Analyzes several URLs concurrently. Metadata fetches are network-bound
+    (yt-dlp releases the GIL during I/O), so a batch completes in roughly the
+    time of its slowest member instead of the sum.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(urls, executor.map(get_video_info, urls)))
+
+
 def extract_available_qualities(info_dict: dict) -> list[str]:
     """
     Parses the info dict to find available MP4 video resolutions,
     ensuring correct 'p' notation (e.g., 1080p from height).
     """
-    qualities = set()
-    for f in info_dict.get('formats', []):
-        if f.get('vcodec') != 'none' and f.get('ext') == 'mp4' and isinstance(f.get('height'), int):
-            qualities.add(f.get('height'))
+    heights = {
+        f['height'] for f in info_dict.get('formats', ())
+        if f.get('ext') == 'mp4' and f.get('vcodec') != 'none' and isinstance(f.get('height'), int)
+    }
+    return [f"{q}p" for q in sorted(heights, reverse=True)] or ['720p', '360p']  # Fallback
 
-    if not qualities:
-        return ['720p', '360p']  # Fallback
 
-    sorted_qualities = sorted(list(qualities), reverse=True)
-    return [f"{q}p" for q in sorted_qualities]
+# Minimum interval between status-box updates: yt-dlp fires hooks many times
+# per second and every update costs a websocket round-trip.
+_UI_UPDATE_INTERVAL = 0.2
 
 
-def progress_hook(d, status_box, progress_state):
-    """Updates the status box with the current download progress and step."""
+def progress_hook(d, progress_queue, progress_state):
+    """
+    Runs on the download worker thread: pushes progress labels onto a
+    thread-safe queue that the script thread drains into the status box.
+    """
     if d['status'] == 'downloading':
-        percent_str = sanitize_for_display(d.get('_percent_str', '0.0%'))
-        speed_str = sanitize_for_display(d.get('_speed_str', 'N/A'))
-        eta_str = sanitize_for_display(d.get('_eta_str', 'N/A'))
+        now = time.monotonic()
+        if now - progress_state['last_ui_ts'] < _UI_UPDATE_INTERVAL:
+            return
+        progress_state['last_ui_ts'] = now
+        progress = sanitize_for_display(
+            f"{d.get('_percent_str', '0.0%')} ({d.get('_speed_str', 'N/A')} - ETA: {d.get('_eta_str', 'N/A')})"
+        )
+        # total_steps is a heuristic: the merge fallback can add a second
+        # download, so grow the total rather than display "Step 2/1".
+        progress_state['total_steps'] = max(progress_state['total_steps'], progress_state['step'])
         step_info = f"Step {progress_state['step']}/{progress_state['total_steps']}:"
-        status_box.update(label=f"{step_info} Downloading... {percent_str} ({speed_str} - ETA: {eta_str})")
+        progress_queue.put(f"{step_info} Downloading... {progress}")
     elif d['status'] == 'finished':
         progress_state['step'] += 1
-        step_info = f"Step {progress_state['step'] - 1}/{progress_state['total_steps']}:"
-        status_box.update(label=f"{step_info} Download finished. Starting conversion...")
+        total_steps = max(progress_state['total_steps'], progress_state['step'] - 1)
+        step_info = f"Step {progress_state['step'] - 1}/{total_steps}:"
+        progress_queue.put(f"{step_info} Download finished. Starting conversion...")
+
 
+def _temp_dir_base() -> str | None:
+    """
+    Prefers RAM-backed /dev/shm on Linux so downloaded bytes never round-trip
+    through disk before being streamed out. Returns None (default temp dir)
+    elsewhere.
+    """
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
 
-def handle_download(url: str, title: str, format_type: str, quality_setting: str):
-    """Handles the download with a step counter and temporary directory."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        safe_title = sanitize_filename(title)
-        output_template = os.path.join(temp_dir, f"{safe_title}.%(ext)s")
 
-        progress_state = {'step': 1, 'total_steps': 1}
+@st.cache_resource(show_spinner=False)
+def _files_dir() -> str:
+    """Directory on the default temp filesystem where finished files live."""
+    path = tempfile.mkdtemp(prefix='youtube_converter_')
+    _JOB_TEMP_DIRS.add(path)  # Removed by the atexit hook.
+    return path
 
-        if format_type == 'mp3':
-            format_string = 'bestaudio/best'
-            postprocessors = [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3', 'preferredquality': quality_setting}]
+
+def _persist_file(filepath: str, dest_dir: str) -> str:
+    """
+    Moves a finished file out of its (possibly RAM-backed) working directory,
+    streaming through a 1 MiB buffer so the copy never holds more than the
+    buffer in memory.
+    """
+    dest = os.path.join(dest_dir, os.path.basename(filepath))
+    with open(filepath, 'rb') as src, open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst, length=1 << 20)
+    os.remove(filepath)
+    return dest
+
+
+def _extract_audio(filepath: str, bitrate: str) -> str:
+    """Converts a downloaded audio stream to mp3. Runs on the worker pool."""
+    with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
+        pp = FFmpegExtractAudioPP(ydl, preferredcodec='mp3', preferredquality=bitrate)
+        files_to_delete, info = pp.run({'filepath': filepath, 'ext': os.path.splitext(filepath)[1].lstrip('.')})
+    for stale_file in files_to_delete:
+        if os.path.exists(stale_file):
+            os.remove(stale_file)
+    return info['filepath']
+
+
+def _run_download(url: str, info: dict | None, job_params: dict, progress_callback) -> str:
+    """
+    Runs on the single download worker. The per-job params, progress hook and
+    final-path resolution all happen here so mutation of the shared instance
+    is serialized with the download it belongs to — a job submitted while
+    another is in flight can't re-point its outtmpl or cross-wire its
+    progress. Reuses the analyze-time formats when they carry URLs, falling
+    back to a fresh extraction when they are absent (info.json cache hits)
+    or have gone stale.
+    """
+    ydl = _download_ydl()
+    ydl.params.update(job_params)
+    # YoutubeDL caches its format selector at __init__, so updating
+    # params['format'] alone is ignored; rebuild the selector for this job.
+    ydl.format_selector = ydl.build_format_selector(job_params['format'])
+    _ACTIVE_PROGRESS_HOOK['callback'] = progress_callback
+    try:
+        info_dict = None
+        if info and any(f.get('url') for f in info.get('formats', ())):
+            try:
+                # process_ie_result mutates its argument, so feed it a copy.
+                info_dict = ydl.process_ie_result(copy.deepcopy(info), download=True)
+            except yt_dlp.utils.DownloadError:
+                info_dict = None
+        if info_dict is None:
+            info_dict = ydl.extract_info(url, download=True)
+        # extract_info raises on failure, so the resolved template is the
+        # final file; no need to traverse requested_downloads or stat it.
+        return ydl.prepare_filename(info_dict)
+    finally:
+        _ACTIVE_PROGRESS_HOOK['callback'] = None
+
+
+def handle_download(url: str, title: str, format_type: str, quality_setting: str, info: dict | None = None):
+    """Downloads the requested stream and queues any conversion on the worker pool."""
+    temp_dir = tempfile.mkdtemp(dir=_temp_dir_base())
+    safe_title = sanitize_filename(title)
+    output_template = os.path.join(temp_dir, f"{safe_title}.%(ext)s")
+
+    progress_state = {'step': 1, 'total_steps': 1, 'last_ui_ts': 0.0}
+
+    if format_type == 'mp3':
+        # No postprocessor here: the mp3 conversion runs in the background
+        # so the network path returns as soon as the raw stream is on disk.
+        format_string = 'bestaudio/best'
+    else:
+        height = quality_setting[:-1]
+        if int(height) <= 720:
+            # Progressive mp4 exists up to 720p: prefer it to skip the second
+            # stream fetch and the ffmpeg mux, with the two-stream merge as a
+            # fallback for videos that lack a progressive stream.
+            format_string = f'best[ext=mp4][height<={height}]/bestvideo[ext=mp4][height<={height}]+bestaudio[ext=m4a]'
         else:
-            height = quality_setting[:-1]
+            # Above 720p only adaptive streams exist; a progressive-first
+            # selector would happily settle for a 720p file, so keep the
+            # merge-first ordering here.
             format_string = f'bestvideo[ext=mp4][height<={height}]+bestaudio[ext=m4a]/best[ext=mp4][height<={height}]'
-            postprocessors = []
-            if '+' in format_string:
-                progress_state['total_steps'] = 2
-
-        ydl_opts = {
-            'outtmpl': output_template,
-            'quiet': True,
-            'no_warnings': True,
-            'format': format_string,
-            'postprocessors': postprocessors,
-            'progress_hooks': [lambda d: progress_hook(d, st.session_state.status_box, progress_state)],
-        }
-
-        try:
-            with st.status("Starting...", expanded=True) as status:
-                st.session_state.status_box = status
-
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    status.update(label=f"Step 1/{progress_state['total_steps']}: Initializing...")
-                    st.write("⚙️ Starting download process...")
-                    info_dict = ydl.extract_info(url, download=True)
-                    actual_filepath = info_dict.get('requested_downloads', [{}])[0].get('filepath')
-
-                if not actual_filepath or not os.path.exists(actual_filepath):
-                    status.update(label="Download Failed", state="error", expanded=False)
-                    st.error("Could not retrieve the final file.")
-                    return
-
-                st.write(f"✅ File saved as: {os.path.basename(actual_filepath)}")
-                status.update(label="Download complete!", state="complete", expanded=False)
-
-            with open(actual_filepath, 'rb') as f:
-                file_bytes = f.read()
-
-            st.download_button(
-                label=f"📥 Download {os.path.basename(actual_filepath)}",
-                data=file_bytes,
-                file_name=os.path.basename(actual_filepath),
-                mime="audio/mpeg" if format_type == "mp3" else "video/mp4",
-                use_container_width=True,
+            progress_state['total_steps'] = 2
+
+    job_params = {
+        'outtmpl': {'default': output_template,
+                    'infojson': os.path.join(_INFO_CACHE_DIR, '%(id)s'),
+                    'thumbnail': os.path.join(_INFO_CACHE_DIR, '%(id)s')},
+        'format': format_string,
+    }
+    progress_queue = queue.Queue()
+
+    try:
+        with st.status("Starting...", expanded=True) as status:
+            status.update(label=f"Step 1/{progress_state['total_steps']}: Initializing...")
+            st.write("⚙️ Starting download process...")
+
+            # Run yt-dlp on the worker thread and keep the script thread free
+            # to drain progress events into the status box.
+            future = _DOWNLOAD_EXECUTOR.submit(
+                _run_download, url, info, job_params,
+                lambda d: progress_hook(d, progress_queue, progress_state),
             )
-        except Exception as e:
-            st.error(f"An unexpected error occurred: {e}")
-        finally:
-            if 'status_box' in st.session_state:
-                del st.session_state.status_box
+            while not (future.done() and progress_queue.empty()):
+                try:
+                    status.update(label=progress_queue.get(timeout=0.1))
+                except queue.Empty:
+                    pass
+
+            actual_filepath = future.result()  # Re-raises any worker exception.
+
+            st.write(f"✅ File saved as: {os.path.basename(actual_filepath)}")
+            status.update(label="Download complete!", state="complete", expanded=False)
+
+        job = {'title': title, 'format_type': format_type, 'temp_dir': temp_dir,
+               'filepath': actual_filepath, 'future': None, 'error': None}
+        if format_type == 'mp3':
+            job['future'] = _POSTPROCESS_EXECUTOR.submit(_extract_audio, actual_filepath, quality_setting)
+        _JOB_TEMP_DIRS.add(temp_dir)
+        st.session_state.pending_jobs.append(job)
+    except Exception as e:
+        st.error(f"An unexpected error occurred: {e}")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def render_download_jobs():
+    """Shows in-flight conversions and download buttons for finished jobs."""
+    if not st.session_state.pending_jobs:
+        return
+
+    st.subheader("📦 Your files")
+    conversion_running = False
+    for i, job in enumerate(st.session_state.pending_jobs):
+        future = job['future']
+        if future is not None:
+            if not future.done():
+                st.caption(f"🎛️ Converting *{job['title']}* to mp3...")
+                conversion_running = True
+                continue
+            try:
+                job['filepath'] = future.result()
+            except Exception as e:
+                job['error'] = str(e)
+            job['future'] = None
+
+        if job['error']:
+            st.error(f"Conversion of '{job['title']}' failed: {job['error']}")
+            # Nothing left to serve: drop the working dir too, or the raw
+            # stream would stay pinned in /dev/shm until process exit.
+            if job['temp_dir'] is not None:
+                _JOB_TEMP_DIRS.discard(job['temp_dir'])
+                shutil.rmtree(job['temp_dir'], ignore_errors=True)
+                job['temp_dir'] = None
+            continue
+
+        if job['temp_dir'] is not None:
+            # Free the /dev/shm working dir: stream the result onto the
+            # default temp filesystem so it stops pinning RAM.
+            job['filepath'] = _persist_file(job['filepath'], _files_dir())
+            _JOB_TEMP_DIRS.discard(job['temp_dir'])
+            shutil.rmtree(job['temp_dir'], ignore_errors=True)
+            job['temp_dir'] = None
+
+        # Hand Streamlit the open file handle so it streams chunks from disk
+        # instead of holding the whole file in memory.
+        st.download_button(
+            label=f"📥 Download {os.path.basename(job['filepath'])}",
+            data=open(job['filepath'], 'rb'),
+            file_name=os.path.basename(job['filepath']),
+            mime="audio/mpeg" if job['format_type'] == "mp3" else "video/mp4",
+            use_container_width=True,
+            key=f"download_job_{i}",
+        )
+
+    if conversion_running:
+        st.button("🔄 Refresh status", use_container_width=True)
 
 
 def main():
     st.set_page_config(page_title="YT Downloader", page_icon="🚀", layout="centered")
 
-    for key in ['video_info', 'available_qualities', 'last_url', 'status_box']:
+    defaults = {'video_info_map': {}, 'last_urls': None, 'pending_jobs': []}
+    for key, value in defaults.items():
         if key not in st.session_state:
-            st.session_state[key] = None if key != 'available_qualities' else []
+            st.session_state[key] = value
 
     st.title("🚀 Open Source YouTube Downloader")
     st.caption("Sick of sketchy download sites loaded with ads? This is your clean, safe, and open-source alternative!")
 
+    concurrent_requests = st.sidebar.slider(
+        "Concurrent analyses", min_value=1, max_value=8, value=3,
+        help="How many videos to analyze in parallel."
+    )
+
     with st.container(border=True):
-        url = st.text_input("🔗 Enter the YouTube URL", placeholder="https://www.youtube.com/watch?v=...")
-        if url and url != st.session_state.last_url:
-            st.session_state.video_info = None
-            st.session_state.available_qualities = []
-            st.session_state.last_url = url
-
-        if st.button("Analyze Video", use_container_width=True, type="primary"):
-            if url:
+        urls_text = st.text_area("🔗 Enter YouTube URLs (one per line)", placeholder="https://www.youtube.com/watch?v=...")
+        if urls_text and urls_text != st.session_state.last_urls:
+            st.session_state.video_info_map = {}
+            st.session_state.last_urls = urls_text
+
+        if st.button("Analyze Videos", use_container_width=True, type="primary"):
+            urls = [u.strip() for u in urls_text.splitlines() if u.strip()]
+            if urls:
                 with st.spinner("Analyzing..."):
-                    info = get_video_info(url)
-                    if info:
-                        st.session_state.video_info = info
-                        st.session_state.available_qualities = extract_available_qualities(info)
-                    else:
-                        st.session_state.video_info = None
-                        st.error("Video not found. Please check the URL.")
+                    st.session_state.video_info_map = get_video_info_batch(urls, concurrent_requests)
             else:
-                st.warning("Please enter a URL.")
+                st.warning("Please enter at least one URL.")
+
+    for i, (video_url, info) in enumerate(st.session_state.video_info_map.items()):
+        if not info:
+            st.error(f"Video not found: {video_url}. Please check the URL.")
+            continue
 
-    if st.session_state.video_info:
         with st.container(border=True):
-            info = st.session_state.video_info
             title = info.get('title', 'Untitled')
             thumbnail_url = info.get('thumbnail')
 
@@ -165,7 +505,8 @@ def main():
             with col2:
                 st.subheader(title)
                 format_choice = st.radio(
-                    "**1. Choose format**", ('🎶 MP3 (Audio)', '🎬 MP4 (Video)'), horizontal=True
+                    "**1. Choose format**", ('🎶 MP3 (Audio)', '🎬 MP4 (Video)'),
+                    horizontal=True, key=f"format_{i}"
                 )
                 format_type = 'mp3' if 'MP3' in format_choice else 'mp4'
 
@@ -174,19 +515,23 @@ def main():
                 if format_type == 'mp3':
                     mp3_bitrate = st.selectbox(
                         "Audio Bitrate (lower is faster)",
-                        options=['128', '192', '256', '320'], index=0, format_func=lambda x: f"{x} kbps"
+                        options=['128', '192', '256', '320'], index=0, format_func=lambda x: f"{x} kbps",
+                        key=f"bitrate_{i}"
                     )
                     quality_setting = mp3_bitrate
                 else:
                     mp4_resolution = st.selectbox(
                         "Video Resolution (higher is slower)",
-                        options=st.session_state.available_qualities
+                        options=extract_available_qualities(info),
+                        key=f"resolution_{i}"
                     )
                     quality_setting = mp4_resolution
 
-                if st.button(f"Start Download", use_container_width=True):
+                if st.button(f"Start Download", use_container_width=True, key=f"download_{i}"):
                     if quality_setting:
-                        handle_download(url, title, format_type, quality_setting)
+                        handle_download(video_url, title, format_type, quality_setting, info=info)
+
+    render_download_jobs()
 
 
 if __name__ == "__main__":